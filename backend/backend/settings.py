@@ -190,14 +190,18 @@ SIMPLE_JWT = {
 # REST Framework settings - Update authentication classes
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'user_auth.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 10
+    'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_RATES': {
+        # Per email address, see user_auth.throttling
+        'password_reset': '5/hour',
+    },
 }
 
 # CORS settings
@@ -212,6 +216,24 @@ SESSION_COOKIE_HTTPONLY = True
 CSRF_COOKIE_SAMESITE = 'Lax'
 CSRF_COOKIE_HTTPONLY = True
 
+# Logging - user_auth request-path messages are DEBUG, so they only show
+# up in development
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'user_auth': {
+            'handlers': ['console'],
+            'level': 'DEBUG' if DEBUG else 'INFO',
+        },
+    },
+}
+
 # Email Configuration - Clean version with environment variables only
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -246,6 +268,7 @@ YOLO_CONFIDENCE_THRESHOLD = 0.3
 # Processing Configuration
 ENABLE_YOLO_PROCESSING = True
 PROCESS_IMAGES_ASYNC = False  # Set to True when Celery is configured
+SEND_EMAILS_ASYNC = False  # Set to True when Celery is configured
 
 # Model Information
 YOLO_MODEL_INFO = {
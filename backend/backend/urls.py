@@ -20,25 +20,40 @@ from . import views
 from user_auth import views as auth_views
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-urlpatterns = [
-    path('admin/', admin.site.urls),
+# Auth endpoints - use user_auth views for consistency. Mounted under a single
+# 'api/auth/' include so the resolver matches the shared prefix once.
+auth_urlpatterns = [
+    path('register/', auth_views.register_user, name='auth-register'),
+    path('login/', auth_views.login_user, name='auth-login'),
+    path('logout/', auth_views.logout_user, name='auth-logout'),
+    path('status/', auth_views.get_user_status, name='auth-status'),
+    path('get-users/', auth_views.get_users, name='get-users'),
+    path('pending-users/', auth_views.get_pending_users, name='auth-pending-users'),
+    
+    # Password reset (the frontend posts to these under /api/auth/)
+    path('request-password-reset/', auth_views.request_password_reset, name='request_password_reset'),
+    path('reset-password/', auth_views.reset_password, name='reset_password'),
     
-    # Auth endpoints - use user_auth views for consistency
-    path('api/auth/register/', auth_views.register_user, name='auth-register'),
-    path('api/auth/login/', auth_views.login_user, name='auth-login'),
-    path('api/auth/logout/', auth_views.logout_user, name='auth-logout'),
-    path('api/auth/status/', auth_views.get_user_status, name='auth-status'),
-    path('api/auth/get-users/', auth_views.get_users, name='get-users'),
-    path('api/auth/approve-user/<int:user_id>/', auth_views.approve_user, name='auth-approve-user'),
-    path('api/auth/update-role/<int:user_id>/', auth_views.update_user_role, name='auth-update-role'),
-    path('api/auth/delete-user/<int:user_id>/', auth_views.delete_user, name='auth-delete-user'),
-    path('api/auth/reject-user/<int:user_id>/', auth_views.reject_user, name='auth-reject-user'),
-    path('api/auth/pause-user/<int:user_id>/', auth_views.pause_user, name='auth-pause-user'),
-    path('api/auth/pending-users/', auth_views.get_pending_users, name='auth-pending-users'),
+    # Per-user admin actions
+    path('approve-user/<int:user_id>/', auth_views.approve_user, name='auth-approve-user'),
+    path('update-role/<int:user_id>/', auth_views.update_user_role, name='auth-update-role'),
+    path('delete-user/<int:user_id>/', auth_views.delete_user, name='auth-delete-user'),
+    path('reject-user/<int:user_id>/', auth_views.reject_user, name='auth-reject-user'),
+    path('pause-user/<int:user_id>/', auth_views.pause_user, name='auth-pause-user'),
+    
+    # Bulk admin actions
+    path('bulk-approve-users/', auth_views.bulk_approve_users, name='auth-bulk-approve-users'),
+    path('bulk-delete-users/', auth_views.bulk_delete_users, name='auth-bulk-delete-users'),
     
     # JWT token endpoints
-    path('api/auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('api/auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+]
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    
+    path('api/auth/', include(auth_urlpatterns)),
     
     # Images app endpoints (includes YOLO processing)
     path('api/images/', include('images.urls')),
@@ -47,6 +62,9 @@ urlpatterns = [
     path('api/images/create-batch/', views.create_batch, name='create_batch'),
     path('api/images/upload/', views.upload_image, name='upload_image'),
     
+    # Several GETs in one round-trip
+    path('api/batch/', views.batch_requests, name='api-batch'),
+    
     # Legacy endpoints (keep for backward compatibility)
     path('api/register/', views.register_user, name='register'),
     path('api/login/', views.login_user, name='login'),
@@ -1,14 +1,17 @@
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpRequest, JsonResponse, QueryDict
 from django.contrib.auth import authenticate, login, logout
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
+from django.db import IntegrityError, transaction
+from django.urls import Resolver404, resolve
 from user_auth.models import CustomUser
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 import json
 import uuid
+from urllib.parse import urlsplit
 import logging
 import requests
 import os
@@ -36,16 +39,21 @@ def register_user(request):
         if not password:
             return JsonResponse({'error': 'Password is required'}, status=400)
         
-        if CustomUser.objects.filter(username=username).exists():
-            return JsonResponse({'error': 'Username already exists'}, status=400)
-            
-        user = CustomUser.objects.create_user(
-            username=username,
-            email=email,
-            password=password,
-            is_approved=False
-            
-        )
+        # A single INSERT; the unique constraints on username and email
+        # reject duplicates without a racy exists() check first
+        try:
+            with transaction.atomic():
+                user = CustomUser.objects.create_user(
+                    username=username,
+                    email=email,
+                    password=password,
+                    is_approved=False
+                )
+        except IntegrityError:
+            # Only the failure path pays for working out which one clashed
+            if CustomUser.objects.filter(username=username).exists():
+                return JsonResponse({'error': 'Username already exists'}, status=400)
+            return JsonResponse({'error': 'Email already registered'}, status=409)
         
         return JsonResponse({
             'message': 'Registration successful. Waiting for admin approval.',
@@ -115,7 +123,7 @@ def approve_user(request, user_id):
     try:
         user = CustomUser.objects.get(id=user_id)
         user.is_approved = True
-        user.save()
+        user.save(update_fields=['is_approved'])
         return JsonResponse({'message': 'User approved successfully'})
     except CustomUser.DoesNotExist:
         return JsonResponse({'error': 'User not found'}, status=404)
@@ -173,7 +181,7 @@ def pause_user(request, user_id):
     try:
         user = CustomUser.objects.get(id=user_id)
         user.is_approved = not user.is_approved  # Toggle approval status
-        user.save()
+        user.save(update_fields=['is_approved'])
         
         action = 'paused' if not user.is_approved else 'unpaused'
         return JsonResponse({'message': f'User {user.username} {action} successfully'})
@@ -357,3 +365,70 @@ def upload_image(request):
         return JsonResponse({'error': 'Upload failed. Please try again.'}, status=500)
     
 
+
+BATCH_MAX_REQUESTS = 20
+
+def _run_batch_item(request, item):
+    """Dispatch one read-only sub-request through the URL resolver"""
+    if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+        return {'status': 400, 'body': {'error': 'Each request needs a path'}}
+    if str(item.get('method', 'GET')).upper() != 'GET':
+        return {'status': 405, 'body': {'error': 'Only GET requests can be batched'}}
+
+    # Paths are relative to /api/, matching how the clients build their URLs
+    parts = urlsplit(item['path'])
+    path = parts.path if parts.path.startswith('/api/') else '/api/' + parts.path.lstrip('/')
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return {'status': 404, 'body': {'error': 'Not found'}}
+    if match.func is batch_requests:
+        return {'status': 400, 'body': {'error': 'Batch requests cannot be nested'}}
+
+    # Same headers (and so the same bearer token) as the outer request; each
+    # view still runs its own authentication and permission checks.
+    sub_request = HttpRequest()
+    sub_request.method = 'GET'
+    sub_request.path = sub_request.path_info = path
+    sub_request.META = {
+        key: value for key, value in request.META.items()
+        if key not in ('CONTENT_LENGTH', 'CONTENT_TYPE')
+    }
+    sub_request.META.update({'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': parts.query})
+    sub_request.GET = QueryDict(parts.query)
+    sub_request.COOKIES = request.COOKIES
+
+    try:
+        response = match.func(sub_request, *match.args, **match.kwargs)
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+    except Exception as e:
+        logger.error(f"Batch sub-request {path} failed: {str(e)}")
+        return {'status': 500, 'body': {'error': 'Internal server error'}}
+
+    content = b''.join(response.streaming_content) if response.streaming else response.content
+    if response.get('Content-Type', '').startswith('application/json'):
+        body = json.loads(content) if content else None
+    else:
+        body = content.decode(response.charset or 'utf-8', errors='replace')
+    return {'status': response.status_code, 'body': body}
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch_requests(request):
+    """
+    Run several GET requests in one round-trip.
+
+    Body: [{"path": "/images/batches/", "method": "GET"}, ...]
+    Returns [{"status": 200, "body": {...}}, ...] in the same order.
+    """
+    items = request.data
+    if not isinstance(items, list) or not items:
+        return JsonResponse({'error': 'Expected a non-empty list of requests'}, status=400)
+    if len(items) > BATCH_MAX_REQUESTS:
+        return JsonResponse(
+            {'error': f'At most {BATCH_MAX_REQUESTS} requests can be batched'}, status=400
+        )
+
+    return JsonResponse([_run_batch_item(request, item) for item in items], safe=False)
@@ -12,6 +12,7 @@ from .tasks import process_image_with_yolo, process_image_with_yolo_sync
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 from django.utils import timezone
+from django.db.models import Count
 
 logger = logging.getLogger(__name__)
 
@@ -262,36 +263,76 @@ def retry_failed_images(request, batch_id):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+# Fields get_batch_list can return: the model columns each one needs and how
+# it is rendered. uploaded_files comes from a Count annotation.
+BATCH_LIST_FIELDS = {
+    'id': (('id',), lambda batch: str(batch.id)),
+    'total_files': (('total_files',), lambda batch: batch.total_files),
+    'uploaded_files': ((), lambda batch: batch.image_count),
+    'processed_files': (('processed_files',), lambda batch: batch.processed_files),
+    'failed_files': (('failed_files',), lambda batch: batch.failed_files),
+    'status': (('status',), lambda batch: batch.status),
+    'progress_percent': (
+        ('processed_files', 'total_files'),
+        lambda batch: (batch.processed_files / batch.total_files) * 100 if batch.total_files > 0 else 0
+    ),
+    'created_at': (('created_at',), lambda batch: batch.created_at.isoformat()),
+    'completed_at': (('completed_at',), lambda batch: batch.completed_at.isoformat() if batch.completed_at else None),
+    'metadata': (('metadata',), lambda batch: batch.metadata),
+}
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_batch_list(request):
-    """Get list of user's batches with filtering"""
+    """
+    Get list of user's batches with filtering
+
+    Optional query params: status, limit (newest N batches) and fields (a
+    comma-separated subset of BATCH_LIST_FIELDS). Only the columns the
+    requested fields need are loaded.
+    """
     try:
         status_filter = request.GET.get('status')
         
+        fields = list(BATCH_LIST_FIELDS)
+        if request.GET.get('fields'):
+            fields = [name.strip() for name in request.GET['fields'].split(',') if name.strip()]
+            unknown = [name for name in fields if name not in BATCH_LIST_FIELDS]
+            if unknown:
+                return JsonResponse({'error': f"Unknown fields: {', '.join(unknown)}"}, status=400)
+        
+        limit = request.GET.get('limit')
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 0
+            if limit <= 0:
+                return JsonResponse({'error': 'limit must be a positive integer'}, status=400)
+        
         batches = UploadBatch.objects.filter(user=request.user)
         
         if status_filter:
             batches = batches.filter(status=status_filter)
         
-        batches_data = []
-        for batch in batches.order_by('-created_at'):
-            batches_data.append({
-                'id': str(batch.id),
-                'total_files': batch.total_files,
-                'uploaded_files': batch.images.count(),
-                'processed_files': batch.processed_files,
-                'failed_files': batch.failed_files,
-                'status': batch.status,
-                'progress_percent': (batch.processed_files / batch.total_files) * 100 if batch.total_files > 0 else 0,
-                'created_at': batch.created_at.isoformat(),
-                'completed_at': batch.completed_at.isoformat() if batch.completed_at else None,
-                'metadata': batch.metadata
-            })
+        total_count = batches.count() if limit else None
+        
+        columns = {column for name in fields for column in BATCH_LIST_FIELDS[name][0]}
+        batches = batches.only('id', *columns).order_by('-created_at')
+        if 'uploaded_files' in fields:
+            # One grouped query instead of a COUNT per batch
+            batches = batches.annotate(image_count=Count('images'))
+        if limit:
+            batches = batches[:limit]
+        
+        batches_data = [
+            {name: BATCH_LIST_FIELDS[name][1](batch) for name in fields}
+            for batch in batches
+        ]
         
         return JsonResponse({
             'batches': batches_data,
-            'total_count': len(batches_data)
+            'total_count': len(batches_data) if total_count is None else total_count
         })
         
     except Exception as e:
@@ -10,6 +10,7 @@ from django.test import Client, override_settings
 from user_auth.models import CustomUser
 from django.core.mail import send_mail
 import json
+import secrets
 
 def test_email_configuration():
     """Test email configuration"""
@@ -122,15 +123,21 @@ def test_password_reset_flow():
             
             # Check if token was generated
             user.refresh_from_db()
-            if user.password_reset_token:
-                print(f"✅ Reset token generated: {user.password_reset_token[:10]}...")
+            if user.password_reset_token_hash:
+                print("✅ Reset token generated")
                 print("📧 Password reset email should be sent to your inbox!")
                 
+                # Only the token digest is stored, so issue a known token
+                # to exercise the reset endpoint
+                token = secrets.token_urlsafe(32)
+                user.set_reset_token(token)
+                user.save()
+                
                 # Test token usage
                 print("\n🔑 Testing password reset with token...")
                 reset_response = client.post('/api/auth/reset-password/',
                     data=json.dumps({
-                        'token': user.password_reset_token,
+                        'token': token,
                         'new_password': 'newtestpassword123'
                     }),
                     content_type='application/json'
@@ -147,7 +154,7 @@ def test_password_reset_flow():
                         
                         # Reset back for future tests
                         user.set_password('testpassword123')
-                        user.password_reset_token = None
+                        user.set_reset_token(None)
                         user.save()
                         print("✅ Test user reset to original state")
                         
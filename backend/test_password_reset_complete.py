@@ -9,6 +9,7 @@ from user_auth.models import CustomUser
 from django.core.mail import send_mail
 from django.conf import settings
 import json
+import secrets
 
 def test_complete_password_reset_flow():
     """Test the complete password reset flow with real email"""
@@ -50,11 +51,16 @@ def test_complete_password_reset_flow():
         
         # Step 3: Check that token was set
         user.refresh_from_db()
-        token = user.password_reset_token
-        if token:
-            print(f"✅ Reset token generated: {token[:10]}...")
+        if user.password_reset_token_hash:
+            print("✅ Reset token generated")
             print("📬 Check your email for the password reset link!")
             
+            # Only the token digest is stored, so issue a known token
+            # to exercise the reset endpoint
+            token = secrets.token_urlsafe(32)
+            user.set_reset_token(token)
+            user.save()
+            
             # Step 4: Test password reset using token
             print(f"\n🔑 Testing password reset with token...")
             response = client.post('/api/auth/reset-password/', {
@@ -74,7 +80,7 @@ def test_complete_password_reset_flow():
                 
                 # Reset back to original password for future tests
                 user.set_password('oldpassword123')
-                user.password_reset_token = None
+                user.set_reset_token(None)
                 user.save()
                 print("✅ Test user password reset to original")
                 
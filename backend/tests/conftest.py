@@ -3,6 +3,9 @@ import django
 import pytest
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test.utils import override_settings
 from rest_framework.test import APIClient
 from user_auth.models import CustomUser
 
@@ -10,9 +13,45 @@ from user_auth.models import CustomUser
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
+@pytest.fixture(autouse=True, scope='session')
+def fast_password_hashing():
+    # PBKDF2 runs hundreds of thousands of iterations per create_user();
+    # MD5 keeps the suite fast. PBKDF2 stays registered so hashes made
+    # with it explicitly (see baseline_user) can still be verified.
+    with override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    ]):
+        yield
+
+@pytest.fixture(scope='session')
+def baseline_user():
+    """Shared user for read-only tests, hashed once per session with the real hasher.
+
+    The instance is never saved, so row counts seen by other tests are
+    unaffected. Tests that use nothing else can be marked no_db to run
+    without the test database.
+    """
+    user = CustomUser(
+        username='testuser',
+        email='test@example.com',
+        role=CustomUser.Role.ANNOTATOR
+    )
+    user.password = make_password('testpass123', hasher='pbkdf2_sha256')
+    return user
+
+@pytest.fixture(autouse=True)
+def enable_db_access_for_all_tests(request):
+    # Opt-out for in-memory tests, so running only those never creates
+    # the test database
+    if request.node.get_closest_marker('no_db') is None:
+        request.getfixturevalue('db')
+
 @pytest.fixture(autouse=True)
-def enable_db_access_for_all_tests(db):
-    pass
+def clear_cache():
+    # Throttle counters live in the cache; don't let them leak between tests
+    cache.clear()
+    yield
 
 @pytest.fixture(autouse=True)
 def setup_test_environment():
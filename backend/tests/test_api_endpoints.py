@@ -2,6 +2,7 @@ import pytest
 from django.urls import reverse
 from rest_framework.test import APIClient
 from user_auth.models import CustomUser
+from images.models import UploadBatch
 from rest_framework_simplejwt.tokens import RefreshToken
 import json
 
@@ -184,7 +185,7 @@ class TestSecurityHeaders:
         api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
         
         response = api_client.get(url)
-        response_data = json.loads(response.content)
+        response_data = json.loads(b''.join(response.streaming_content))
         
         # Check that password hashes are not included
         for user in response_data['users']:
@@ -319,3 +320,66 @@ class TestConcurrency:
         
         annotator_user.refresh_from_db()
         assert annotator_user.role == 'ADMIN'
+
+class TestBatchEndpoint:
+    """Test the /api/batch/ multi-request endpoint"""
+    
+    def test_batch_dispatches_each_request(self, api_client, admin_token):
+        """Test that each sub-request gets its own status and body, in order"""
+        url = reverse('api-batch')
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token["access"]}')
+        
+        data = [
+            {'path': '/auth/status/', 'method': 'GET'},
+            {'path': '/auth/get-users/?page=1', 'method': 'GET'},
+            {'path': '/does-not-exist/', 'method': 'GET'},
+            {'path': '/auth/bulk-delete-users/', 'method': 'POST'},
+        ]
+        response = api_client.post(url, data, format='json')
+        assert response.status_code == 200
+        
+        results = json.loads(response.content)
+        assert [r['status'] for r in results] == [200, 200, 404, 405]
+        assert results[0]['body']['user']['username'] == 'admin'
+        assert 'users' in results[1]['body']
+
+    def test_batch_sub_requests_keep_permissions(self, api_client, annotator_token):
+        """Test that sub-requests run with the caller's permissions"""
+        url = reverse('api-batch')
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {annotator_token["access"]}')
+        
+        response = api_client.post(url, [{'path': '/auth/get-users/'}, {'path': '/batch/'}], format='json')
+        assert response.status_code == 200
+        assert [r['status'] for r in json.loads(response.content)] == [403, 400]
+
+    def test_batch_requires_authentication(self, api_client):
+        """Test that the batch endpoint itself requires authentication"""
+        response = api_client.post(reverse('api-batch'), [{'path': '/auth/status/'}], format='json')
+        assert response.status_code == 401
+
+class TestBatchListParameters:
+    """Test limit/fields on the upload batch list"""
+    
+    def test_batch_list_limit_and_fields(self, api_client, admin_user, admin_token):
+        """Test that limit and fields trim the batch list"""
+        for total in (1, 2, 3, 4):
+            UploadBatch.objects.create(user=admin_user, total_files=total)
+        url = reverse('batch-list')
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token["access"]}')
+        
+        response = api_client.get(url, {'limit': 3, 'fields': 'id,status,uploaded_files,total_files'})
+        assert response.status_code == 200
+        
+        data = json.loads(response.content)
+        assert data['total_count'] == 4
+        assert [b['total_files'] for b in data['batches']] == [4, 3, 2]
+        assert set(data['batches'][0]) == {'id', 'status', 'uploaded_files', 'total_files'}
+        assert data['batches'][0]['uploaded_files'] == 0
+
+    def test_batch_list_rejects_bad_parameters(self, api_client, admin_token):
+        """Test that unknown fields and non-positive limits are refused"""
+        url = reverse('batch-list')
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token["access"]}')
+        
+        assert api_client.get(url, {'fields': 'id,password'}).status_code == 400
+        assert api_client.get(url, {'limit': '0'}).status_code == 400
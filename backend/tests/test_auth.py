@@ -1,8 +1,11 @@
 import pytest
 from django.urls import reverse
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory
 from user_auth.models import CustomUser
+from user_auth.authentication import CachedJWTAuthentication
 from rest_framework_simplejwt.tokens import RefreshToken
+from user_auth.views import request_password_reset
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
 from django.db import IntegrityError
 import json
 
@@ -112,7 +115,7 @@ class TestUserManagement:
         api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token["access"]}')
         response = api_client.get(url)
         assert response.status_code == 200
-        response_data = json.loads(response.content)
+        response_data = json.loads(b''.join(response.streaming_content))
         assert 'users' in response_data
 
     def test_get_all_users_annotator(self, api_client, annotator_token):
@@ -157,6 +160,109 @@ class TestUserManagement:
         response = api_client.post(url, data, format='json')
         assert response.status_code == 400
 
+class TestBulkUserActions:
+    def test_bulk_approve_users(self, api_client, admin_user, admin_token, pending_user):
+        other = CustomUser.objects.create_user(
+            username='pending2', email='pending2@example.com', password='pendingpass123'
+        )
+        url = reverse('auth-bulk-approve-users')
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token["access"]}')
+        response = api_client.post(
+            url, {'user_ids': [pending_user.id, other.id, admin_user.id]}, format='json'
+        )
+        assert response.status_code == 200
+        response_data = json.loads(response.content)
+        assert response_data['approved_count'] == 2
+        assert admin_user.id not in response_data['approved']
+        assert not CustomUser.objects.filter(is_approved=False).exists()
+
+    def test_bulk_delete_users_skips_self(self, api_client, admin_user, admin_token, pending_user, annotator_user):
+        url = reverse('auth-bulk-delete-users')
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token["access"]}')
+        response = api_client.post(
+            url, {'user_ids': [pending_user.id, annotator_user.id, admin_user.id]}, format='json'
+        )
+        assert response.status_code == 200
+        assert json.loads(response.content)['deleted_count'] == 2
+        assert list(CustomUser.objects.values_list('id', flat=True)) == [admin_user.id]
+
+    def test_bulk_actions_validate_payload(self, api_client, admin_token, annotator_token):
+        url = reverse('auth-bulk-approve-users')
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token["access"]}')
+        response = api_client.post(url, {'user_ids': 'all'}, format='json')
+        assert response.status_code == 400
+
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {annotator_token["access"]}')
+        response = api_client.post(url, {'user_ids': [1]}, format='json')
+        assert response.status_code == 403
+
+class TestAdminRole:
+    def test_non_admin_is_rejected(self, api_client, annotator_user):
+        access = RefreshToken.for_user(annotator_user).access_token
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        response = api_client.get(reverse('get-users'))
+        assert response.status_code == 403
+        assert json.loads(response.content) == {'error': 'Unauthorized'}
+
+    def test_promoted_user_is_admin_after_refresh(self, api_client, admin_token, annotator_user):
+        refresh = str(RefreshToken.for_user(annotator_user))
+
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token["access"]}')
+        response = api_client.post(
+            reverse('auth-update-role', args=[annotator_user.id]), {'role': 'ADMIN'}, format='json'
+        )
+        assert response.status_code == 200
+
+        api_client.credentials()
+        response = api_client.post(reverse('token_refresh'), {'refresh': refresh}, format='json')
+        assert response.status_code == 200
+        access = json.loads(response.content)['access']
+
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        response = api_client.get(reverse('get-users'))
+        assert response.status_code == 200
+
+    def test_demoted_admin_is_rejected(self, api_client, admin_user):
+        access = RefreshToken.for_user(admin_user).access_token
+        CustomUser.objects.filter(id=admin_user.id).update(role='ANNOTATOR')
+        CachedJWTAuthentication.clear_cache()
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        response = api_client.get(reverse('get-users'))
+        assert response.status_code == 403
+
+class TestAdminUserActions:
+    def test_actions_skip_the_read_back(self, api_client, admin_user, pending_user, django_assert_num_queries):
+        api_client.force_authenticate(user=admin_user)
+
+        # One SELECT of the summary, one UPDATE
+        with django_assert_num_queries(2):
+            response = api_client.post(reverse('auth-approve-user', args=[pending_user.id]))
+        assert json.loads(response.content)['user']['is_approved'] is True
+
+        with django_assert_num_queries(2):
+            response = api_client.post(
+                reverse('auth-update-role', args=[pending_user.id]), {'role': 'VERIFIER'}, format='json'
+            )
+        assert json.loads(response.content)['user']['role'] == 'VERIFIER'
+
+        with django_assert_num_queries(2):
+            response = api_client.post(reverse('auth-pause-user', args=[pending_user.id]))
+        response_data = json.loads(response.content)
+        assert response_data['message'] == 'User paused successfully'
+        assert response_data['user'] == {
+            'id': pending_user.id, 'username': 'pending', 'email': 'pending@example.com',
+            'is_approved': False, 'role': 'VERIFIER',
+        }
+
+        pending_user.refresh_from_db()
+        assert (pending_user.is_approved, pending_user.role) == (False, 'VERIFIER')
+
+    def test_actions_on_missing_user(self, api_client, admin_user):
+        api_client.force_authenticate(user=admin_user)
+        for name in ('auth-approve-user', 'auth-pause-user'):
+            response = api_client.post(reverse(name, args=[9999]))
+            assert response.status_code == 404
+
 class TestPagination:
     def test_get_users_pagination(self, api_client, admin_token):
         url = reverse('get_users')
@@ -171,6 +277,27 @@ class TestPagination:
         assert 'total_users' in response_data['pagination']
         assert 'per_page' in response_data['pagination']
 
+    def test_next_cursor_round_trips_through_query_string(self, api_client, admin_user, admin_token):
+        for i in range(4):
+            CustomUser.objects.create_user(username=f'cursor{i}', email=f'cursor{i}@example.com', password='x')
+        url = reverse('get-users')
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token["access"]}')
+
+        seen = []
+        query = 'per_page=2'
+        while query:
+            response = api_client.get(f'{url}?{query}')
+            assert response.status_code == 200
+            response_data = json.loads(response.content)
+            seen += [user['id'] for user in response_data['users']]
+            cursor = response_data['pagination']['next_cursor']
+            # Pasted in unescaped, as a client building the URL by hand would
+            query = cursor and (
+                f"per_page=2&after_date_joined={cursor['after_date_joined']}&after_id={cursor['after_id']}"
+            )
+
+        assert sorted(seen) == sorted(CustomUser.objects.values_list('id', flat=True))
+
 class TestTokenRefresh:
     def test_refresh_token(self, api_client, admin_token):
         url = reverse('token_refresh')
@@ -186,6 +313,93 @@ class TestTokenRefresh:
         response = api_client.post(url, data, format='json')
         assert response.status_code == 401
 
+class TestCachedJWTAuthentication:
+    def test_repeated_token_skips_user_lookup(self, admin_user, admin_token, django_assert_num_queries):
+        CachedJWTAuthentication.clear_cache()
+        factory = APIRequestFactory()
+        auth = CachedJWTAuthentication()
+        header = f"Bearer {admin_token['access']}"
+
+        with django_assert_num_queries(1):
+            user, _ = auth.authenticate(factory.get('/', HTTP_AUTHORIZATION=header))
+        with django_assert_num_queries(0):
+            cached_user, _ = auth.authenticate(factory.get('/', HTTP_AUTHORIZATION=header))
+
+        assert user.pk == cached_user.pk == admin_user.pk
+        assert cached_user.role == 'ADMIN'
+
+    def test_forget_user_drops_cached_entries(self, admin_user, admin_token, django_assert_num_queries):
+        CachedJWTAuthentication.clear_cache()
+        factory = APIRequestFactory()
+        auth = CachedJWTAuthentication()
+        header = f"Bearer {admin_token['access']}"
+        auth.authenticate(factory.get('/', HTTP_AUTHORIZATION=header))
+
+        CustomUser.objects.filter(id=admin_user.id).update(role='ANNOTATOR')
+        CachedJWTAuthentication.forget_user(admin_user.id)
+
+        with django_assert_num_queries(1):
+            user, _ = auth.authenticate(factory.get('/', HTTP_AUTHORIZATION=header))
+        assert user.role == 'ANNOTATOR'
+
+    def test_model_save_and_delete_evict_cached_user(self, admin_user, admin_token, annotator_user):
+        CachedJWTAuthentication.clear_cache()
+        factory = APIRequestFactory()
+        auth = CachedJWTAuthentication()
+        header = f"Bearer {admin_token['access']}"
+        auth.authenticate(factory.get('/', HTTP_AUTHORIZATION=header))
+
+        # e.g. deactivated through the Django admin change form
+        user = CustomUser.objects.get(id=admin_user.id)
+        user.is_active = False
+        user.save()
+        with pytest.raises(AuthenticationFailed):
+            auth.authenticate(factory.get('/', HTTP_AUTHORIZATION=header))
+
+        access = str(RefreshToken.for_user(annotator_user).access_token)
+        auth.authenticate(factory.get('/', HTTP_AUTHORIZATION=f'Bearer {access}'))
+        CustomUser.objects.filter(id=annotator_user.id).delete()
+        with pytest.raises(AuthenticationFailed):
+            auth.authenticate(factory.get('/', HTTP_AUTHORIZATION=f'Bearer {access}'))
+
+    def test_authenticated_user_skips_secret_columns(self, admin_user, admin_token):
+        CachedJWTAuthentication.clear_cache()
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f"Bearer {admin_token['access']}")
+        user, _ = CachedJWTAuthentication().authenticate(request)
+
+        deferred = user.get_deferred_fields()
+        assert {'password', 'password_reset_token_hash', 'password_reset_expires_at'} <= deferred
+
+    def test_cache_hits_return_a_fresh_user(self, admin_user, admin_token, django_assert_num_queries):
+        CachedJWTAuthentication.clear_cache()
+        factory = APIRequestFactory()
+        auth = CachedJWTAuthentication()
+        header = f"Bearer {admin_token['access']}"
+        first, _ = auth.authenticate(factory.get('/', HTTP_AUTHORIZATION=header))
+        first.role = 'ANNOTATOR'
+
+        with django_assert_num_queries(0):
+            second, _ = auth.authenticate(factory.get('/', HTTP_AUTHORIZATION=header))
+        assert second is not first
+        assert second.role == 'ADMIN'
+        assert second.get_deferred_fields() == first.get_deferred_fields()
+
+    def test_full_cache_evicts_oldest_entry(self, admin_token, annotator_user, monkeypatch):
+        CachedJWTAuthentication.clear_cache()
+        monkeypatch.setattr(CachedJWTAuthentication, 'cache_maxsize', 2)
+        factory = APIRequestFactory()
+        auth = CachedJWTAuthentication()
+        headers = [
+            f"Bearer {admin_token['access']}",
+            f"Bearer {RefreshToken.for_user(annotator_user).access_token}",
+            f"Bearer {RefreshToken.for_user(annotator_user).access_token}",
+        ]
+        for header in headers:
+            auth.authenticate(factory.get('/', HTTP_AUTHORIZATION=header))
+
+        cached = [v[1] for v in CachedJWTAuthentication._cache.values()]
+        assert cached == [annotator_user.id, annotator_user.id]
+
 class TestErrorHandling:
     def test_register_with_existing_username(self, api_client):
         # Create a user first
@@ -303,7 +517,7 @@ class TestPasswordReset:
         
         # Check that token was set
         user.refresh_from_db()
-        assert user.password_reset_token is not None
+        assert user.password_reset_token_hash is not None
 
     def test_request_password_reset_invalid_email(self, api_client):
         url = reverse('request_password_reset')
@@ -312,6 +526,38 @@ class TestPasswordReset:
         # Should still return 200 to avoid email enumeration
         assert response.status_code == 200
 
+    def test_request_password_reset_matches_email_case_insensitively(self, api_client):
+        user = CustomUser.objects.create_user(username='testuser', email='Test@Example.com', password='x')
+        response = api_client.post(reverse('request_password_reset'), {'email': 'test@EXAMPLE.com'}, format='json')
+        assert response.status_code == 200
+        user.refresh_from_db()
+        assert user.password_reset_token_hash is not None
+
+    def test_request_password_reset_rejects_non_string_email(self, api_client):
+        url = reverse('request_password_reset')
+        for email in (['a@example.com'], {'email': 'a@example.com'}, 42):
+            response = api_client.post(url, {'email': email}, format='json')
+            assert response.status_code == 400
+
+    def test_request_password_reset_is_throttled_per_email(self):
+        factory = APIRequestFactory()
+        for _ in range(5):
+            response = request_password_reset(
+                factory.post('/', {'email': 'nobody@example.com'}, format='json')
+            )
+            assert response.status_code == 200
+        
+        response = request_password_reset(
+            factory.post('/', {'email': 'NOBODY@example.com'}, format='json')
+        )
+        assert response.status_code == 429
+        
+        # Other addresses are counted separately
+        response = request_password_reset(
+            factory.post('/', {'email': 'someone@example.com'}, format='json')
+        )
+        assert response.status_code == 200
+
     def test_reset_password_valid_token(self, api_client):
         user = CustomUser.objects.create_user(
             username='testuser',
@@ -320,7 +566,7 @@ class TestPasswordReset:
         )
         
         # Set a reset token
-        user.password_reset_token = 'valid_token_123'
+        user.set_reset_token('valid_token_123')
         user.save()
         
         url = reverse('reset_password')
@@ -334,7 +580,7 @@ class TestPasswordReset:
         # Verify password was changed and token was cleared
         user.refresh_from_db()
         assert user.check_password('newpass123')
-        assert user.password_reset_token is None
+        assert user.password_reset_token_hash is None
 
     def test_reset_password_invalid_token(self, api_client):
         url = reverse('reset_password')
@@ -378,7 +624,7 @@ class TestDataValidation:
             password='oldpass123'
         )
         
-        user.password_reset_token = 'valid_token_123'
+        user.set_reset_token('valid_token_123')
         user.save()
         
         url = reverse('reset_password')
@@ -570,16 +816,25 @@ class TestSecurityAndEdgeCases:
         response = api_client.post(url, data, format='json')
         assert response.status_code == 200
         
-        # Try to create with different case
+        # Usernames are case-sensitive, so a different case is a new user
         data = {
             'username': 'TestUser',
-            'email': 'Test@Example.com',
+            'email': 'other@example.com',
             'password': 'pass123',
             'role': 'ANNOTATOR'
         }
         response = api_client.post(url, data, format='json')
-        # Should succeed as they are different
         assert response.status_code == 200
+        
+        # Emails are unique regardless of case
+        data = {
+            'username': 'AnotherUser',
+            'email': 'Test@Example.com',
+            'password': 'pass123',
+            'role': 'ANNOTATOR'
+        }
+        response = api_client.post(url, data, format='json')
+        assert response.status_code == 409
 
 class TestRateLimiting:
     def test_registration_rate_limiting(self, api_client):
@@ -649,22 +904,20 @@ class TestDataIntegrity:
                     password='pass123'
                 )
         
-        # Email uniqueness is NOT enforced in this model
-        # This documents the current behavior
-        user2 = CustomUser.objects.create_user(
+        # Email uniqueness is enforced case-insensitively
+        CustomUser.objects.create_user(
             username='user2',
             email='same@example.com',
             password='pass123'
         )
         
-        # This should succeed - email uniqueness not enforced
-        user3 = CustomUser.objects.create_user(
-            username='user3',
-            email='same@example.com',  # Same email allowed
-            password='pass123'
-        )
-        
-        assert user2.email == user3.email
+        with transaction.atomic():
+            with pytest.raises(IntegrityError):
+                CustomUser.objects.create_user(
+                    username='user3',
+                    email='Same@example.com',  # Same email, different case
+                    password='pass123'
+                )
 
     def test_role_enum_validation(self, db):
         """Test role enum validation"""
@@ -742,9 +995,9 @@ class TestAuditAndLogging:
         assert response.status_code == 200
         
         user = CustomUser.objects.get(username='tracked_user')
-        # Verify timestamps are set
+        # Verify timestamps are set; last_login waits for the first login
         assert user.date_joined is not None
-        assert user.last_login is not None
+        assert user.last_login is None
 
     def test_role_change_tracking(self, api_client, admin_token):
         """Test that role changes can be tracked"""
@@ -1,4 +1,5 @@
 import pytest
+from django.core import mail
 from django.urls import reverse
 from rest_framework.test import APIClient
 from user_auth.models import CustomUser
@@ -159,10 +160,13 @@ class TestCompleteUserWorkflow:
         response = api_client.post(reset_request_url, reset_request_data, format='json')
         assert response.status_code == 200
         
-        # Verify reset token was set
+        # Verify reset token was set; only its digest is stored, so take
+        # the raw token from the emailed reset link
         user.refresh_from_db()
-        assert user.password_reset_token is not None
-        reset_token = user.password_reset_token
+        assert user.password_reset_token_hash is not None
+        assert len(mail.outbox) == 1
+        reset_token = mail.outbox[0].body.split('/reset-password/')[1].split()[0]
+        assert user.verify_reset_token(reset_token)
         
         # Step 3: User resets password with token
         reset_password_url = reverse('reset_password')
@@ -177,7 +181,7 @@ class TestCompleteUserWorkflow:
         user.refresh_from_db()
         assert user.check_password('newpass123') == True
         assert user.check_password('oldpass123') == False
-        assert user.password_reset_token is None
+        assert user.password_reset_token_hash is None
         
         # Step 4: User can login with new password
         login_url = reverse('login')
@@ -2,11 +2,30 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import CustomUser
 
+@admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
     list_display = ('username', 'email', 'is_approved', 'role', 'is_staff', 'date_joined', 'last_login')
     list_filter = ('is_approved', 'is_staff', 'is_superuser', 'role')
     search_fields = ('username', 'email')
     ordering = ('-date_joined',)
+    list_per_page = 50
+    list_max_show_all = 100
+    # Skip the unfiltered COUNT(*) the changelist runs on every page
+    show_full_result_count = False
+    
+    # Columns needed to render, filter and order the changelist
+    changelist_fields = (
+        'id', 'username', 'email', 'is_approved', 'role', 'is_staff',
+        'is_superuser', 'date_joined', 'last_login'
+    )
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # Only trim the listing; the change form needs every column
+        match = request.resolver_match
+        if match and match.url_name == f'{self.opts.app_label}_{self.opts.model_name}_changelist':
+            queryset = queryset.only(*self.changelist_fields)
+        return queryset
     
     fieldsets = (
         (None, {'fields': ('username', 'password')}),
@@ -21,6 +40,4 @@ class CustomUserAdmin(UserAdmin):
             'classes': ('wide',),
             'fields': ('username', 'email', 'password1', 'password2', 'is_approved', 'role'),
         }),
-    )
-
-admin.site.register(CustomUser, CustomUserAdmin) 
\ No newline at end of file
+    ) 
\ No newline at end of file
@@ -0,0 +1,124 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that remembers successfully authenticated tokens for a
+    short time, so repeated requests with the same bearer token skip both the
+    signature check and the user lookup.
+
+    CustomUser.save() and deletes evict the affected user; code that changes
+    users with queryset.update() must call forget_user(s) itself. The cache
+    lives in each process, so eviction only reaches the process that made
+    the change. Other workers keep serving the old user for up to cache_ttl.
+
+    Entries hold the user's column values rather than the instance, and each
+    hit builds a fresh user from them, so one request setting attributes on
+    request.user cannot leak into the next.
+    """
+
+    cache_ttl = 60
+    cache_maxsize = 10_000
+
+    # Columns the views read from request.user. Everything else stays deferred,
+    # in particular the password hash and the reset token digest/expiry.
+    user_fields = (
+        'id', 'username', 'email', 'role', 'is_approved',
+        'is_active', 'is_staff', 'is_superuser',
+    )
+
+    # Kept in insertion order, so a full cache evicts from the front
+    _cache = OrderedDict()
+    _lock = threading.Lock()
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        key = hashlib.sha256(raw_token).digest()
+        now = time.time()
+
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is not None and entry[0] > now:
+            expires_at, user_id, db, field_names, values, validated_token = entry
+            return self.user_model.from_db(db, field_names, values), validated_token
+
+        validated_token = self.get_validated_token(raw_token)
+        user = self.get_user(validated_token)
+
+        # Never keep an entry past the token's own expiry.
+        expires_at = min(now + self.cache_ttl, validated_token.get('exp', now))
+        if expires_at > now:
+            field_names = tuple(
+                f.attname for f in user._meta.concrete_fields
+                if f.attname in user.__dict__
+            )
+            values = tuple(getattr(user, name) for name in field_names)
+            self._store(key, (expires_at, user.pk, user._state.db, field_names, values, validated_token))
+
+        return user, validated_token
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # The revocation check needs the password hash, so keep the stock lookup.
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        try:
+            user = self.user_model.objects.only(*self.user_fields).get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            ) from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
+
+    @classmethod
+    def _store(cls, key, entry):
+        with cls._lock:
+            cls._cache.pop(key, None)
+            while len(cls._cache) >= cls.cache_maxsize:
+                cls._cache.popitem(last=False)
+            cls._cache[key] = entry
+
+    @classmethod
+    def forget_user(cls, user_id):
+        """Drop cached entries for a user whose role, approval or existence changed"""
+        cls.forget_users([user_id])
+
+    @classmethod
+    def forget_users(cls, user_ids):
+        user_ids = set(user_ids)
+        with cls._lock:
+            for key in [k for k, v in cls._cache.items() if v[1] in user_ids]:
+                del cls._cache[key]
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._cache.clear()
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 13:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('user_auth', '0004_alter_customuser_options_customuser_accuracy_score_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(condition=models.Q(('is_approved', False)), fields=['role'], name='pending_by_role_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['-date_joined'], name='auth_user_date_jo_bfa7a7_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 13:40
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_reset_tokens(apps, schema_editor):
+    # Keep outstanding reset links working by storing the digest of each
+    # plaintext token before the old column is dropped.
+    CustomUser = apps.get_model('user_auth', 'CustomUser')
+    users = CustomUser.objects.exclude(password_reset_token__isnull=True).exclude(password_reset_token='')
+    for user in users.iterator():
+        user.password_reset_token_hash = hashlib.sha256(user.password_reset_token.encode()).digest()
+        user.password_reset_token = None
+        user.save(update_fields=['password_reset_token', 'password_reset_token_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth', '0005_customuser_pending_by_role_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='password_reset_token_hash',
+            field=models.BinaryField(blank=True, db_index=True, max_length=32, null=True),
+        ),
+        migrations.RunPython(hash_existing_reset_tokens, migrations.RunPython.noop),
+    ]
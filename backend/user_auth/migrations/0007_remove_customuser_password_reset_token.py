@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 13:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth', '0006_customuser_password_reset_token_hash'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='customuser',
+            name='password_reset_token',
+        ),
+    ]
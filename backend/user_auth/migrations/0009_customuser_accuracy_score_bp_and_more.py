@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 13:47
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def copy_accuracy_to_basis_points(apps, schema_editor):
+    CustomUser = apps.get_model('user_auth', 'CustomUser')
+    for user in CustomUser.objects.exclude(accuracy_score=0).only('id', 'accuracy_score').iterator():
+        user.accuracy_score_bp = int(user.accuracy_score * 10000)
+        user.save(update_fields=['accuracy_score_bp'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth', '0008_remove_customuser_auth_user_email_ece7f7_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='accuracy_score_bp',
+            field=models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(10000)]),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='avg_annotation_time_minutes',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(copy_accuracy_to_basis_points, migrations.RunPython.noop),
+    ]
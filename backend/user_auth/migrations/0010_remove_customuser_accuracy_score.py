@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 13:47
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth', '0009_customuser_accuracy_score_bp_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='customuser',
+            name='accuracy_score',
+        ),
+    ]
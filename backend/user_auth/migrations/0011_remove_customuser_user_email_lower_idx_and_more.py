@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-16 13:50
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_duplicate_emails(apps, schema_editor):
+    # Emails were not unique before this migration. Fail with the offending
+    # addresses instead of a bare IntegrityError from the constraint.
+    CustomUser = apps.get_model('user_auth', 'CustomUser')
+    duplicates = list(
+        CustomUser.objects.exclude(email='')
+        .values(email_lower=Lower('email'))
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+        .values_list('email_lower', flat=True)
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Cannot add uniq_email_ci: these emails belong to more than one '
+            'account (case-insensitive): ' + ', '.join(sorted(duplicates)) +
+            '. Merge, delete or re-address the extra accounts and migrate again.'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('user_auth', '0010_remove_customuser_accuracy_score'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_email_lower_idx',
+        ),
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='customuser',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email', ''), _negated=True), name='uniq_email_ci'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 13:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth', '0011_remove_customuser_user_email_lower_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='last_login',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='last login'),
+        ),
+    ]
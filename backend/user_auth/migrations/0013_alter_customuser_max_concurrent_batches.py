@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 13:53
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth', '0012_alter_customuser_last_login'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='max_concurrent_batches',
+            field=models.PositiveSmallIntegerField(default=2, help_text='Maximum number of batches an annotator can work on simultaneously', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(100)]),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 13:55
+
+from django.db import migrations
+
+# Admin search_fields use ILIKE '%term%', which a B-tree cannot serve.
+# Trigram GIN indexes can, but they only exist on PostgreSQL, so they are
+# created here rather than declared in CustomUser.Meta.indexes (SQLite is
+# used for development and tests).
+TRIGRAM_INDEXES = (
+    ('user_username_trgm', 'username'),
+    ('user_email_trgm', 'email'),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON auth_user USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth', '0013_alter_customuser_max_concurrent_batches'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 13:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth', '0014_customuser_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='password_reset_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 14:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('user_auth', '0015_customuser_password_reset_expires_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['is_approved', '-date_joined'], name='user_approved_joined_idx'),
+        ),
+    ]
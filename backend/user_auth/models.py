@@ -1,6 +1,15 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.db.models import F, Q
+from django.db.models.functions import Lower
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
+from datetime import timedelta
+from functools import cached_property
+import hashlib
+import hmac
 import json
 
 class CustomUser(AbstractUser):
@@ -9,20 +18,30 @@ class CustomUser(AbstractUser):
         ANNOTATOR = 'ANNOTATOR', 'Annotator'
         VERIFIER = 'VERIFIER', 'Verifier'
 
+    # How long an emailed password reset link stays valid
+    RESET_TOKEN_LIFETIME = timedelta(hours=1)
+
     # Basic fields (existing)
     is_approved = models.BooleanField(default=False)
     date_joined = models.DateTimeField(auto_now_add=True)
-    last_login = models.DateTimeField(auto_now=True)
     role = models.CharField(
         max_length=20,
         choices=Role.choices,
         default=Role.ANNOTATOR
     )
-    password_reset_token = models.CharField(max_length=100, null=True, blank=True)
+    # SHA-256 digest of the emailed reset token; the raw token is never stored
+    password_reset_token_hash = models.BinaryField(
+        max_length=32,
+        null=True,
+        blank=True,
+        db_index=True
+    )
+    password_reset_expires_at = models.DateTimeField(null=True, blank=True)
     
     # New role-specific fields
-    max_concurrent_batches = models.IntegerField(
+    max_concurrent_batches = models.PositiveSmallIntegerField(
         default=2,
+        validators=[MinValueValidator(1), MaxValueValidator(100)],
         help_text="Maximum number of batches an annotator can work on simultaneously"
     )
     annotation_specialty = models.CharField(
@@ -38,40 +57,145 @@ class CustomUser(AbstractUser):
         help_text="Medical expertise area for verifiers"
     )
     
-    # Performance tracking fields
+    # Performance tracking fields; bump the counters through
+    # increment_annotations() / increment_verifications(), not save()
     total_annotations_completed = models.IntegerField(default=0)
     total_verifications_completed = models.IntegerField(default=0)
-    avg_annotation_time_minutes = models.DecimalField(
-        max_digits=5, 
-        decimal_places=2, 
-        default=0.00
-    )
-    accuracy_score = models.DecimalField(
-        max_digits=3, 
-        decimal_places=2, 
-        default=0.00,
-        validators=[MinValueValidator(0.00), MaxValueValidator(1.00)]
+    avg_annotation_time_minutes = models.FloatField(default=0.0)
+    # Accuracy in basis points (0..10000); read through accuracy_score
+    accuracy_score_bp = models.PositiveSmallIntegerField(
+        default=0,
+        validators=[MaxValueValidator(10000)]
     )
     
     class Meta:
         db_table = 'auth_user'
         indexes = [
             models.Index(fields=['role', 'is_approved']),
-            models.Index(fields=['email']),
             models.Index(fields=['is_active']),
+            # Pending-user lookups only ever touch unapproved rows, so keep
+            # the index limited to them; pair with .only() on the query
+            models.Index(
+                fields=['role'],
+                condition=Q(is_approved=False),
+                name='pending_by_role_idx'
+            ),
+            models.Index(fields=['-date_joined']),
+            # Admin user lists filter on approval and show newest first
+            models.Index(
+                fields=['is_approved', '-date_joined'],
+                name='user_approved_joined_idx'
+            ),
+        ]
+        constraints = [
+            # One account per email, compared case-insensitively. Blank emails
+            # are exempt. The index is partial, so lower(email) lookups can only
+            # use it when they also exclude email=''.
+            models.UniqueConstraint(
+                Lower('email'),
+                condition=~Q(email=''),
+                name='uniq_email_ci'
+            ),
         ]
 
+    @property
+    def accuracy_score(self):
+        """Accuracy as a fraction between 0.0 and 1.0"""
+        return self.accuracy_score_bp / 10000.0
+    
+    @accuracy_score.setter
+    def accuracy_score(self, value):
+        self.accuracy_score_bp = round(float(value) * 10000)
+    
     def __str__(self):
         return f"{self.username} ({self.role})"
     
+    @staticmethod
+    def hash_reset_token(token):
+        """Return the digest stored for a raw password reset token"""
+        return hashlib.sha256(token.encode()).digest()
+    
+    def set_reset_token(self, token):
+        """Store the digest and expiry of a reset token, or clear both when token is None"""
+        if token:
+            self.password_reset_token_hash = self.hash_reset_token(token)
+            self.password_reset_expires_at = timezone.now() + self.RESET_TOKEN_LIFETIME
+        else:
+            self.password_reset_token_hash = None
+            self.password_reset_expires_at = None
+    
+    def verify_reset_token(self, token):
+        """Check a supplied, unexpired password reset token in constant time"""
+        if not self.password_reset_token_hash or not token:
+            return False
+        if not self.password_reset_expires_at or self.password_reset_expires_at <= timezone.now():
+            return False
+        return hmac.compare_digest(
+            bytes(self.password_reset_token_hash),
+            self.hash_reset_token(token)
+        )
+    
+    def increment_annotations(self):
+        """Atomically count one more completed annotation for this user"""
+        type(self).objects.filter(pk=self.pk).update(
+            total_annotations_completed=F('total_annotations_completed') + 1
+        )
+        self.refresh_from_db(fields=['total_annotations_completed'])
+    
+    def increment_verifications(self):
+        """Atomically count one more completed verification for this user"""
+        type(self).objects.filter(pk=self.pk).update(
+            total_verifications_completed=F('total_verifications_completed') + 1
+        )
+        self.refresh_from_db(fields=['total_verifications_completed'])
+    
+    @cached_property
     def can_annotate(self):
         """Check if user can perform annotations"""
-        return self.role in [self.Role.ANNOTATOR, self.Role.ADMIN] and self.is_approved
+        return self.is_approved and self.role in _ANNOTATE_ROLES
     
+    @cached_property
     def can_verify(self):
         """Check if user can perform verifications"""
-        return self.role in [self.Role.VERIFIER, self.Role.ADMIN] and self.is_approved
+        return self.is_approved and self.role in _VERIFY_ROLES
     
+    @cached_property
     def can_admin(self):
         """Check if user has admin privileges"""
-        return self.role == self.Role.ADMIN and self.is_approved
\ No newline at end of file
+        return self.is_approved and self.role == self.Role.ADMIN
+    
+    def _clear_permission_cache(self):
+        for name in _PERMISSION_PROPERTIES:
+            self.__dict__.pop(name, None)
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._clear_permission_cache()
+        # Covers every save path (API views, Django admin, legacy views);
+        # queryset.update() bypasses this, so those callers evict themselves
+        _forget_cached_login(self.pk)
+    
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._clear_permission_cache()
+
+
+# Role sets consulted by the can_* permission checks
+_ANNOTATE_ROLES = frozenset({CustomUser.Role.ANNOTATOR, CustomUser.Role.ADMIN})
+_VERIFY_ROLES = frozenset({CustomUser.Role.VERIFIER, CustomUser.Role.ADMIN})
+
+# Memoized can_* properties, dropped whenever the row is saved or reloaded
+_PERMISSION_PROPERTIES = ('can_annotate', 'can_verify', 'can_admin')
+
+
+def _forget_cached_login(user_id):
+    # Imported lazily: the authentication module pulls in simplejwt, which
+    # needs the app registry to be ready
+    from .authentication import CachedJWTAuthentication
+    CachedJWTAuthentication.forget_user(user_id)
+
+
+@receiver(post_delete, sender=CustomUser)
+def _forget_deleted_user(sender, instance, **kwargs):
+    # Also sent per row by queryset.delete(), so bulk deletes are covered
+    _forget_cached_login(instance.pk)
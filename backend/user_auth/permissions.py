@@ -0,0 +1,17 @@
+from rest_framework.permissions import BasePermission
+
+from .models import CustomUser
+
+
+class IsAdminRole(BasePermission):
+    """
+    Allows admins only, judged by the user's current role so that a role
+    change applies to tokens that were issued before it.
+    """
+
+    # Same body the views used to return for non-admins
+    message = {'error': 'Unauthorized'}
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and user.role == CustomUser.Role.ADMIN)
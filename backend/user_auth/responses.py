@@ -0,0 +1,43 @@
+from django.http import HttpResponse, StreamingHttpResponse
+import orjson
+
+def _dumps(data):
+    return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+class OrjsonResponse(HttpResponse):
+    """
+    JsonResponse replacement that serializes with orjson.
+
+    datetimes, dates and UUIDs are handled natively; anything else orjson
+    does not know (Decimal, lazy strings) falls back to str().
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=_dumps(data), **kwargs)
+
+def _iter_json_list(key, rows, chunk_size):
+    yield b'{' + _dumps(key) + b':['
+    buffer = []
+    separator = b''
+    for row in rows:
+        buffer.append(_dumps(row))
+        if len(buffer) >= chunk_size:
+            yield separator + b','.join(buffer)
+            separator = b','
+            buffer = []
+    if buffer:
+        yield separator + b','.join(buffer)
+    yield b']}'
+
+def streaming_list_response(key, rows, chunk_size=500):
+    """
+    Stream {"<key>": [row, ...]} without building the list in memory.
+
+    rows should be a lazy iterable such as queryset.values().iterator(), so
+    only one chunk of rows is held at a time.
+    """
+    return StreamingHttpResponse(
+        _iter_json_list(key, rows, chunk_size),
+        content_type='application/json'
+    )
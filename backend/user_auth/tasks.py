@@ -0,0 +1,56 @@
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import send_mail
+from .models import CustomUser
+import logging
+
+logger = logging.getLogger(__name__)
+
+def send_password_reset_email_sync(username, email, token):
+    """Send the password reset link for a freshly issued token"""
+    reset_link = f"http://localhost:5173/reset-password/{token}"
+
+    email_subject = "Password Reset Request - KPA Annotation Tool"
+    email_body = f"""
+Dear {username},
+
+You have requested to reset your password for the KPA Annotation Tool.
+
+Click the link below to reset your password:
+{reset_link}
+
+This link will expire in 1 hour for security reasons.
+
+If you did not request this password reset, please ignore this email and your password will remain unchanged.
+
+For support, contact: {settings.DEFAULT_FROM_EMAIL}
+
+Best regards,
+KPA Annotation Tool Team
+    """.strip()
+
+    send_mail(
+        subject=email_subject,
+        message=email_body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[email],
+        fail_silently=False,
+    )
+
+@shared_task(bind=True, max_retries=3)
+def send_password_reset_email(self, user_id, token):
+    """Password reset email off the request path (Celery version)"""
+    try:
+        username, email = CustomUser.objects.values_list(
+            'username', 'email'
+        ).get(id=user_id)
+    except CustomUser.DoesNotExist:
+        logger.warning(f"Password reset email skipped, user {user_id} no longer exists")
+        return False
+
+    try:
+        send_password_reset_email_sync(username, email, token)
+        return True
+    except Exception as e:
+        logger.error(f"Password reset email error for user {user_id}: {str(e)}")
+        raise self.retry(countdown=60 * (self.request.retries + 1))
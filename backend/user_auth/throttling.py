@@ -0,0 +1,19 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class PasswordResetRateThrottle(SimpleRateThrottle):
+    """
+    Limits password reset requests per target email address, so one caller
+    cannot make the server mint tokens and send mail for an address without
+    bound. Requests without an email fall back to the client IP.
+    """
+
+    scope = 'password_reset'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email')
+        if isinstance(email, str) and email:
+            ident = email.strip().lower()
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
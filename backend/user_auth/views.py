@@ -1,66 +1,85 @@
 from django.shortcuts import render
-from django.http import JsonResponse
 from django.contrib.auth import authenticate, login, logout
 from django.views.decorators.csrf import csrf_exempt
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.response import Response
+from .authentication import CachedJWTAuthentication
 from .models import CustomUser
-import json
+from .permissions import IsAdminRole
+from .responses import OrjsonResponse, streaming_list_response
+from .tasks import send_password_reset_email, send_password_reset_email_sync
+from .throttling import PasswordResetRateThrottle
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.core.mail import send_mail
+import json
+import orjson
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 import secrets
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from rest_framework import status
+import datetime
 import logging
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
+# Role values accepted by update_user_role
+_VALID_ROLES = frozenset(CustomUser.Role.values)
+
 @csrf_exempt
 def register_user(request):
     if request.method == 'POST':
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         username = data.get('username')
         email = data.get('email')
         password = data.get('password')
         role = data.get('role', CustomUser.Role.ANNOTATOR)
         
-        if CustomUser.objects.filter(username=username).exists():
-            return JsonResponse({'error': 'Username already exists'}, status=400)
-            
-        user = CustomUser.objects.create_user(
-            username=username,
-            email=email,
-            password=password,
-            is_approved=False,
-            role=role
-        )
+        # A single INSERT; the unique constraints on username and email
+        # reject duplicates without a racy exists() check first
+        try:
+            with transaction.atomic():
+                user = CustomUser.objects.create_user(
+                    username=username,
+                    email=email,
+                    password=password,
+                    is_approved=False,
+                    role=role
+                )
+        except IntegrityError:
+            # Only the failure path pays for working out which one clashed
+            if CustomUser.objects.filter(username=username).exists():
+                return OrjsonResponse({'error': 'Username already exists'}, status=400)
+            return OrjsonResponse({'error': 'Email already registered'}, status=409)
         
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'Registration successful. Waiting for admin approval.',
             'user_id': user.id
         })
     
-    return JsonResponse({'error': 'Invalid request method'}, status=400)
+    return OrjsonResponse({'error': 'Invalid request method'}, status=400)
 
 @csrf_exempt
 def login_user(request):
     if request.method == 'POST':
         try:
-            data = json.loads(request.body)
+            data = orjson.loads(request.body)
             username = data.get('username')
             password = data.get('password')
             
-            print(f"Login attempt for user: {username}")
+            logger.debug("Login attempt for user: %s", username)
             
             user = authenticate(request, username=username, password=password)
             
             if user is not None:
-                print(f"User authenticated: {user.username}")
+                logger.debug("User authenticated: %s", user.username)
                 if user.is_approved:
                     login(request, user)
                     # Get tokens
@@ -77,32 +96,32 @@ def login_user(request):
                         'accessToken': str(refresh.access_token),
                         'refreshToken': str(refresh)
                     }
-                    print(f"Sending response: {response_data}")
-                    return JsonResponse(response_data)
+                    logger.info("login_ok user_id=%s", user.id)
+                    return OrjsonResponse(response_data)
                 else:
-                    print(f"User {username} not approved")
-                    return JsonResponse({'error': 'Account pending approval'}, status=403)
+                    logger.debug("User %s not approved", username)
+                    return OrjsonResponse({'error': 'Account pending approval'}, status=403)
             else:
-                print(f"Invalid credentials for user: {username}")
-                return JsonResponse({'error': 'Invalid credentials'}, status=401)
+                logger.debug("Invalid credentials for user: %s", username)
+                return OrjsonResponse({'error': 'Invalid credentials'}, status=401)
         except Exception as e:
-            print(f"Login error: {str(e)}")
-            return JsonResponse({'error': str(e)}, status=500)
+            logger.error("Login error: %s", e)
+            return OrjsonResponse({'error': str(e)}, status=500)
     
-    return JsonResponse({'error': 'Invalid request method'}, status=400)
+    return OrjsonResponse({'error': 'Invalid request method'}, status=400)
 
 @csrf_exempt
 def logout_user(request):
     if request.method == 'POST':
         logout(request)
-        return JsonResponse({'message': 'Logout successful'})
+        return OrjsonResponse({'message': 'Logout successful'})
     
-    return JsonResponse({'error': 'Invalid request method'}, status=400)
+    return OrjsonResponse({'error': 'Invalid request method'}, status=400)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_user_status(request):
-    return JsonResponse({
+    return OrjsonResponse({
         'user': {
             'id': request.user.id,
             'username': request.user.username,
@@ -114,131 +133,145 @@ def get_user_status(request):
 
 @csrf_exempt
 @api_view(['GET'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsAdminRole])
 def get_all_users(request):
     if request.method == 'GET':
-        # Check if the requesting user is an admin
-        if not request.user.role == CustomUser.Role.ADMIN:
-            return JsonResponse({'error': 'Unauthorized'}, status=403)
+        # values() skips model instantiation, and streaming the rows keeps
+        # only one iterator chunk in memory however many users there are
+        users = CustomUser.objects.values(
+            'id', 'username', 'email', 'role', 'is_approved', 'date_joined', 'last_login'
+        ).iterator(chunk_size=500)
         
-        users = CustomUser.objects.all()
-        users_data = [{
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'role': user.role,
-            'is_approved': user.is_approved,
-            'date_joined': user.date_joined.isoformat(),
-            'last_login': user.last_login.isoformat() if user.last_login else None
-        } for user in users]
-        
-        return JsonResponse({'users': users_data})
+        return streaming_list_response('users', users)
     
-    return JsonResponse({'error': 'Invalid request method'}, status=400)
+    return OrjsonResponse({'error': 'Invalid request method'}, status=400)
+
+def _user_summary(user_id):
+    """
+    The user fields the admin actions echo back, read before their UPDATE.
+    The caller patches in the values it writes, so no read-back is needed.
+    """
+    return CustomUser.objects.values(
+        'id', 'username', 'email', 'is_approved', 'role'
+    ).get(id=user_id)
 
 @csrf_exempt
 @api_view(['POST'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsAdminRole])
 def approve_user(request, user_id):
     if request.method == 'POST':
-        # Check if the requesting user is an admin
-        if not request.user.role == CustomUser.Role.ADMIN:
-            return JsonResponse({'error': 'Unauthorized'}, status=403)
-        
         try:
-            user = CustomUser.objects.get(id=user_id)
-            user.is_approved = True
-            user.save()
-            return JsonResponse({
-                'message': 'User approved successfully',
-                'user': {
-                    'id': user.id,
-                    'username': user.username,
-                    'email': user.email,
-                    'is_approved': user.is_approved,
-                    'role': user.role
-                }
-            })
+            user_data = _user_summary(user_id)
         except CustomUser.DoesNotExist:
-            return JsonResponse({'error': 'User not found'}, status=404)
+            return OrjsonResponse({'error': 'User not found'}, status=404)
+        
+        # Narrow UPDATE of the one column instead of a full-row save()
+        CustomUser.objects.filter(id=user_id).update(is_approved=True)
+        CachedJWTAuthentication.forget_user(user_id)
+        user_data['is_approved'] = True
+        
+        return OrjsonResponse({
+            'message': 'User approved successfully',
+            'user': user_data
+        })
     
-    return JsonResponse({'error': 'Invalid request method'}, status=400)
+    return OrjsonResponse({'error': 'Invalid request method'}, status=400)
 
 @csrf_exempt
 @api_view(['POST'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsAdminRole])
 def update_user_role(request, user_id):
     if request.method == 'POST':
-        # Check if the requesting user is an admin
-        if not request.user.role == CustomUser.Role.ADMIN:
-            return JsonResponse({'error': 'Unauthorized'}, status=403)
-        
         try:
-            data = json.loads(request.body)
+            data = orjson.loads(request.body)
             new_role = data.get('role')
             
-            if new_role not in [role[0] for role in CustomUser.Role.choices]:
-                return JsonResponse({'error': 'Invalid role'}, status=400)
+            if new_role not in _VALID_ROLES:
+                return OrjsonResponse({'error': 'Invalid role'}, status=400)
             
-            user = CustomUser.objects.get(id=user_id)
-            user.role = new_role
-            user.save()
+            user_data = _user_summary(user_id)
+            CustomUser.objects.filter(id=user_id).update(role=new_role)
+            # Cached logins must not keep acting with the old role
+            CachedJWTAuthentication.forget_user(user_id)
+            user_data['role'] = new_role
             
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': 'User role updated successfully',
-                'user': {
-                    'id': user.id,
-                    'username': user.username,
-                    'email': user.email,
-                    'is_approved': user.is_approved,
-                    'role': user.role
-                }
+                'user': user_data
             })
         except CustomUser.DoesNotExist:
-            return JsonResponse({'error': 'User not found'}, status=404)
+            return OrjsonResponse({'error': 'User not found'}, status=404)
         except json.JSONDecodeError:
-            return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+            return OrjsonResponse({'error': 'Invalid JSON data'}, status=400)
     
-    return JsonResponse({'error': 'Invalid request method'}, status=400)
+    return OrjsonResponse({'error': 'Invalid request method'}, status=400)
 
 @api_view(['GET'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsAdminRole])
 def get_pending_users(request):
-    if not request.user.role == CustomUser.Role.ADMIN:
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-        
-    pending_users = CustomUser.objects.filter(is_approved=False)
-    users_data = [{
-        'id': user.id,
-        'username': user.username,
-        'email': user.email,
-        'date_joined': user.date_joined,
-        'role': user.role
-    } for user in pending_users]
+    users_data = list(CustomUser.objects.filter(is_approved=False).values(
+        'id', 'username', 'email', 'date_joined', 'role'
+    ).order_by('-date_joined'))
     
-    return JsonResponse({'users': users_data})
+    return OrjsonResponse({'users': users_data})
+
+def _next_users_cursor(users_data, per_page):
+    """Cursor for the page after users_data, or None on the last page"""
+    if len(users_data) < per_page:
+        return None
+    last = users_data[-1]
+    # UTC with a Z suffix: isoformat()'s '+00:00' offset would be decoded as
+    # a space by clients that put the cursor into a query string unescaped.
+    # Microseconds are kept so the cursor round-trips exactly
+    date_joined = last['date_joined'].astimezone(datetime.timezone.utc)
+    return {
+        'after_date_joined': date_joined.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+        'after_id': last['id'],
+    }
 
 @csrf_exempt
 @api_view(['GET'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsAdminRole])
 def get_users(request):
-    if not request.user.role == CustomUser.Role.ADMIN:
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-    
     try:
         # Get query parameters
         page = int(request.GET.get('page', 1))
         per_page = int(request.GET.get('per_page', 10))
         is_approved = request.GET.get('is_approved')
+        after_id = request.GET.get('after_id')
+        after_date_joined = request.GET.get('after_date_joined')
         
-        # Base queryset
-        users = CustomUser.objects.all()
+        # Base queryset, newest first with id as a tie-breaker so the order
+        # is stable for both page and cursor pagination
+        users = CustomUser.objects.values(
+            'id', 'username', 'email', 'date_joined', 'is_approved', 'role'
+        ).order_by('-date_joined', '-id')
         
         # Apply filters
         if is_approved is not None:
             is_approved = is_approved.lower() == 'true'
             users = users.filter(is_approved=is_approved)
         
+        # Keyset pagination: seek past the cursor instead of OFFSET-scanning,
+        # and skip the COUNT(*)
+        if after_id is not None and after_date_joined is not None:
+            cursor_date = parse_datetime(after_date_joined)
+            if cursor_date is None:
+                return OrjsonResponse({'error': 'Invalid after_date_joined'}, status=400)
+            users = users.filter(
+                Q(date_joined__lt=cursor_date) |
+                Q(date_joined=cursor_date, id__lt=int(after_id))
+            )
+            users_data = list(users[:per_page])
+            
+            return OrjsonResponse({
+                'users': users_data,
+                'pagination': {
+                    'per_page': per_page,
+                    'next_cursor': _next_users_cursor(users_data, per_page)
+                }
+            })
+        
         # Calculate pagination
         total_users = users.count()
         total_pages = (total_users + per_page - 1) // per_page
@@ -246,74 +279,52 @@ def get_users(request):
         # Get paginated users
         start = (page - 1) * per_page
         end = start + per_page
-        paginated_users = users[start:end]
-        
-        # Prepare response data
-        users_data = [{
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'date_joined': user.date_joined,
-            'is_approved': user.is_approved,
-            'role': user.role
-        } for user in paginated_users]
+        users_data = list(users[start:end])
         
-        return JsonResponse({
+        return OrjsonResponse({
             'users': users_data,
             'pagination': {
                 'current_page': page,
                 'total_pages': total_pages,
                 'total_users': total_users,
-                'per_page': per_page
+                'per_page': per_page,
+                'next_cursor': _next_users_cursor(users_data, per_page)
             }
         })
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return OrjsonResponse({'error': str(e)}, status=400)
 
 @csrf_exempt
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([PasswordResetRateThrottle])
 def request_password_reset(request):
     email = request.data.get('email')
     if not email:
         return Response({'error': 'Email is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if not isinstance(email, str):
+        return Response({'error': 'Email must be a string'}, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        user = CustomUser.objects.get(email=email)
+        # The exclude() matches the partial unique index's condition, which
+        # is what lets the planner use it for the lower(email) lookup.
+        # Lowering the parameter in SQL too keeps both sides on the
+        # database's case folding rather than mixing in Python's
+        user = CustomUser.objects.alias(email_lower=Lower('email')).exclude(email='').get(
+            email_lower=Lower(Value(email))
+        )
         # Generate a secure random token
         token = secrets.token_urlsafe(32)
-        user.password_reset_token = token
-        user.save()
+        user.set_reset_token(token)
+        user.save(update_fields=['password_reset_token_hash', 'password_reset_expires_at'])
         
-        # Enhanced email template
-        reset_link = f"http://localhost:5173/reset-password/{token}"
-        
-        email_subject = "Password Reset Request - KPA Annotation Tool"
-        email_body = f"""
-Dear {user.username},
-
-You have requested to reset your password for the KPA Annotation Tool.
-
-Click the link below to reset your password:
-{reset_link}
-
-This link will expire in 1 hour for security reasons.
-
-If you did not request this password reset, please ignore this email and your password will remain unchanged.
-
-For support, contact: {settings.DEFAULT_FROM_EMAIL}
-
-Best regards,
-KPA Annotation Tool Team
-        """.strip()
-        
-        send_mail(
-            subject=email_subject,
-            message=email_body,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            fail_silently=False,
-        )
+        if getattr(settings, 'SEND_EMAILS_ASYNC', False):
+            # Queue the email once the token is committed so the worker is
+            # not held up by SMTP
+            user_id = user.id
+            transaction.on_commit(lambda: send_password_reset_email.delay(user_id, token))
+        else:
+            send_password_reset_email_sync(user.username, user.email, token)
         
         return Response(
             {'message': 'If an account exists with this email, you will receive a password reset link'}, 
@@ -343,7 +354,13 @@ def reset_password(request):
                        status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        user = CustomUser.objects.get(password_reset_token=token)
+        # Expired tokens are filtered out by the query itself
+        user = CustomUser.objects.get(
+            password_reset_token_hash=CustomUser.hash_reset_token(token),
+            password_reset_expires_at__gt=timezone.now()
+        )
+        if not user.verify_reset_token(token):
+            raise CustomUser.DoesNotExist
         # Validate password
         try:
             validate_password(new_password, user)
@@ -351,8 +368,8 @@ def reset_password(request):
             return Response({'error': e.messages}, status=status.HTTP_400_BAD_REQUEST)
             
         user.set_password(new_password)
-        user.password_reset_token = None  # Clear the token
-        user.save()
+        user.set_reset_token(None)  # Clear the token
+        user.save(update_fields=['password', 'password_reset_token_hash', 'password_reset_expires_at'])
         return Response({'message': 'Password reset successful'}, status=status.HTTP_200_OK)
     except CustomUser.DoesNotExist:
         return Response({'error': 'Invalid or expired token'}, status=status.HTTP_400_BAD_REQUEST)
@@ -361,19 +378,15 @@ def reset_password(request):
 
 @csrf_exempt
 @api_view(['POST'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsAdminRole])
 def reject_user(request, user_id):
     if request.method == 'POST':
-        # Check if the requesting user is an admin
-        if not request.user.role == CustomUser.Role.ADMIN:
-            return JsonResponse({'error': 'Unauthorized'}, status=403)
-        
         try:
             user = CustomUser.objects.get(id=user_id)
             
             # Prevent admin from rejecting themselves
             if user.id == request.user.id:
-                return JsonResponse({'error': 'Cannot reject your own account'}, status=400)
+                return OrjsonResponse({'error': 'Cannot reject your own account'}, status=400)
             
             # Store user info for response
             user_info = {
@@ -386,30 +399,26 @@ def reject_user(request, user_id):
             # Delete the user (rejection = permanent removal)
             user.delete()
             
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': 'User rejected and removed successfully',
                 'user': user_info
             })
         except CustomUser.DoesNotExist:
-            return JsonResponse({'error': 'User not found'}, status=404)
+            return OrjsonResponse({'error': 'User not found'}, status=404)
     
-    return JsonResponse({'error': 'Invalid request method'}, status=400)
+    return OrjsonResponse({'error': 'Invalid request method'}, status=400)
 
 @csrf_exempt
 @api_view(['DELETE'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsAdminRole])
 def delete_user(request, user_id):
     if request.method == 'DELETE':
-        # Check if the requesting user is an admin
-        if not request.user.role == CustomUser.Role.ADMIN:
-            return JsonResponse({'error': 'Unauthorized'}, status=403)
-        
         try:
             user = CustomUser.objects.get(id=user_id)
             
             # Prevent admin from deleting themselves
             if user.id == request.user.id:
-                return JsonResponse({'error': 'Cannot delete your own account'}, status=400)
+                return OrjsonResponse({'error': 'Cannot delete your own account'}, status=400)
             
             # Store user info for response
             user_info = {
@@ -422,48 +431,83 @@ def delete_user(request, user_id):
             # Delete the user
             user.delete()
             
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': 'User deleted successfully',
                 'user': user_info
             })
         except CustomUser.DoesNotExist:
-            return JsonResponse({'error': 'User not found'}, status=404)
+            return OrjsonResponse({'error': 'User not found'}, status=404)
     
-    return JsonResponse({'error': 'Invalid request method'}, status=400)
+    return OrjsonResponse({'error': 'Invalid request method'}, status=400)
+
+def _bulk_user_ids(request):
+    """user_ids from a bulk request body, minus the requesting admin, or None if malformed"""
+    user_ids = request.data.get('user_ids')
+    if not isinstance(user_ids, list) or not all(
+        isinstance(user_id, int) and not isinstance(user_id, bool) for user_id in user_ids
+    ):
+        return None
+    # Admins cannot approve or delete their own account through a bulk action
+    return [user_id for user_id in user_ids if user_id != request.user.id]
 
 @csrf_exempt
 @api_view(['POST'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsAdminRole])
+def bulk_approve_users(request):
+    user_ids = _bulk_user_ids(request)
+    if user_ids is None:
+        return OrjsonResponse({'error': 'user_ids must be a list of user ids'}, status=400)
+    
+    # One UPDATE ... WHERE id IN (...) for the whole batch
+    updated = CustomUser.objects.filter(id__in=user_ids).update(is_approved=True)
+    CachedJWTAuthentication.forget_users(user_ids)
+    
+    return OrjsonResponse({
+        'message': f'{updated} users approved successfully',
+        'approved': user_ids,
+        'approved_count': updated
+    })
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdminRole])
+def bulk_delete_users(request):
+    user_ids = _bulk_user_ids(request)
+    if user_ids is None:
+        return OrjsonResponse({'error': 'user_ids must be a list of user ids'}, status=400)
+    
+    _, deleted_per_model = CustomUser.objects.filter(id__in=user_ids).delete()
+    deleted = deleted_per_model.get(CustomUser._meta.label, 0)
+    
+    return OrjsonResponse({
+        'message': f'{deleted} users deleted successfully',
+        'deleted': user_ids,
+        'deleted_count': deleted
+    })
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdminRole])
 def pause_user(request, user_id):
     if request.method == 'POST':
-        # Check if the requesting user is an admin
-        if not request.user.role == CustomUser.Role.ADMIN:
-            return JsonResponse({'error': 'Unauthorized'}, status=403)
+        # Prevent admin from pausing themselves
+        if user_id == request.user.id:
+            return OrjsonResponse({'error': 'Cannot pause your own account'}, status=400)
         
         try:
-            user = CustomUser.objects.get(id=user_id)
-            
-            # Prevent admin from pausing themselves
-            if user.id == request.user.id:
-                return JsonResponse({'error': 'Cannot pause your own account'}, status=400)
-            
+            user_data = _user_summary(user_id)
             # Toggle the approval status (pause/unpause)
-            user.is_approved = not user.is_approved
-            user.save()
+            user_data['is_approved'] = not user_data['is_approved']
+            CustomUser.objects.filter(id=user_id).update(is_approved=user_data['is_approved'])
+            CachedJWTAuthentication.forget_user(user_id)
             
-            action = 'paused' if not user.is_approved else 'unpaused'
+            action = 'paused' if not user_data['is_approved'] else 'unpaused'
             
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': f'User {action} successfully',
-                'user': {
-                    'id': user.id,
-                    'username': user.username,
-                    'email': user.email,
-                    'is_approved': user.is_approved,
-                    'role': user.role
-                }
+                'user': user_data
             })
         except CustomUser.DoesNotExist:
-            return JsonResponse({'error': 'User not found'}, status=404)
+            return OrjsonResponse({'error': 'User not found'}, status=404)
     
-    return JsonResponse({'error': 'Invalid request method'}, status=400)
\ No newline at end of file
+    return OrjsonResponse({'error': 'Invalid request method'}, status=400)
\ No newline at end of file
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-16 14:08
+
+from django.db import migrations, models
+
+
+PAYLOAD_KEYS = ('corrected_keypoints', 'keypoint_accuracy_scores', 'problematic_keypoints')
+
+
+def fold_json_columns_into_payload(apps, schema_editor):
+    Verification = apps.get_model('verifications', 'Verification')
+    for verification in Verification.objects.only('id', *PAYLOAD_KEYS).iterator():
+        payload = {
+            key: getattr(verification, key)
+            for key in PAYLOAD_KEYS
+            if getattr(verification, key) is not None
+        }
+        if payload:
+            verification.quality_payload = payload
+            verification.save(update_fields=['quality_payload'])
+
+
+def unfold_payload_into_json_columns(apps, schema_editor):
+    Verification = apps.get_model('verifications', 'Verification')
+    for verification in Verification.objects.exclude(quality_payload={}).only('id', 'quality_payload').iterator():
+        for key in PAYLOAD_KEYS:
+            setattr(verification, key, verification.quality_payload.get(key))
+        verification.save(update_fields=list(PAYLOAD_KEYS))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verification',
+            name='quality_payload',
+            field=models.JSONField(blank=True, default=dict, help_text='Keypoint corrections, per-keypoint accuracy and problematic keypoints'),
+        ),
+        migrations.RunPython(fold_json_columns_into_payload, unfold_payload_into_json_columns),
+        migrations.RemoveField(
+            model_name='verification',
+            name='corrected_keypoints',
+        ),
+        migrations.RemoveField(
+            model_name='verification',
+            name='keypoint_accuracy_scores',
+        ),
+        migrations.RemoveField(
+            model_name='verification',
+            name='problematic_keypoints',
+        ),
+    ]
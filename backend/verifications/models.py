@@ -5,6 +5,27 @@ import uuid
 
 User = get_user_model()
 
+class VerificationQuerySet(models.QuerySet):
+    # Large per-row blobs that summary listings never render
+    DETAIL_FIELDS = (
+        'quality_payload',
+        'correction_summary',
+        'detailed_feedback',
+        'feedback_to_annotator',
+        'internal_notes',
+        'rejection_details',
+    )
+    
+    def without_details(self):
+        """Skip loading (and JSON-decoding) the feedback and quality payload columns"""
+        return self.defer(*self.DETAIL_FIELDS)
+
+class VerificationManager(models.Manager.from_queryset(VerificationQuerySet)):
+    """Joins the annotation, its image and the verifier that __str__ and listings read"""
+    
+    def get_queryset(self):
+        return super().get_queryset().select_related('annotation__image', 'verifier')
+
 class Verification(models.Model):
     """Quality control entity for annotation verification"""
     
@@ -58,10 +79,12 @@ class Verification(models.Model):
     )
     
     # Corrections and feedback
-    corrected_keypoints = models.JSONField(
-        null=True,
+    # corrected_keypoints, keypoint_accuracy_scores and problematic_keypoints
+    # share one JSON column; read and write them through the properties below
+    quality_payload = models.JSONField(
+        default=dict,
         blank=True,
-        help_text="Verifier's corrections to keypoints"
+        help_text="Keypoint corrections, per-keypoint accuracy and problematic keypoints"
     )
     correction_summary = models.TextField(blank=True, null=True)
     detailed_feedback = models.TextField(blank=True, null=True)
@@ -97,18 +120,6 @@ class Verification(models.Model):
         validators=[MinValueValidator(1), MaxValueValidator(10)]
     )
     
-    # Specific quality metrics
-    keypoint_accuracy_scores = models.JSONField(
-        null=True,
-        blank=True,
-        help_text="Per-keypoint accuracy assessment"
-    )
-    problematic_keypoints = models.JSONField(
-        null=True,
-        blank=True,
-        help_text="List of keypoint IDs with issues"
-    )
-    
     # Rejection handling
     rejection_reason = models.CharField(
         max_length=30,
@@ -156,6 +167,8 @@ class Verification(models.Model):
     # Timing
     verified_at = models.DateTimeField(auto_now_add=True)
     
+    objects = VerificationManager()
+    
     class Meta:
         db_table = 'verifications'
         indexes = [
@@ -171,6 +184,42 @@ class Verification(models.Model):
     def __str__(self):
         return f"Verification: {self.annotation.image.filename} - {self.decision}"
     
+    def _get_payload(self, key):
+        return self.quality_payload.get(key)
+    
+    def _set_payload(self, key, value):
+        if value is None:
+            self.quality_payload.pop(key, None)
+        else:
+            self.quality_payload[key] = value
+    
+    @property
+    def corrected_keypoints(self):
+        """Verifier's corrections to keypoints"""
+        return self._get_payload('corrected_keypoints')
+    
+    @corrected_keypoints.setter
+    def corrected_keypoints(self, value):
+        self._set_payload('corrected_keypoints', value)
+    
+    @property
+    def keypoint_accuracy_scores(self):
+        """Per-keypoint accuracy assessment"""
+        return self._get_payload('keypoint_accuracy_scores')
+    
+    @keypoint_accuracy_scores.setter
+    def keypoint_accuracy_scores(self, value):
+        self._set_payload('keypoint_accuracy_scores', value)
+    
+    @property
+    def problematic_keypoints(self):
+        """List of keypoint IDs with issues"""
+        return self._get_payload('problematic_keypoints')
+    
+    @problematic_keypoints.setter
+    def problematic_keypoints(self, value):
+        self._set_payload('problematic_keypoints', value)
+    
     def is_approved(self):
         """Check if annotation was approved"""
         return self.decision in ['APPROVED', 'APPROVED_WITH_CORRECTIONS']
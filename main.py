@@ -3,7 +3,7 @@ import sys
 import os
 
 def main():
-    print("Starting both servers in separate terminals...")
+    print("Starting both servers...")
     
     # Get the absolute path to the Python executable
     python_exe = sys.executable.replace('\\', '/')
@@ -20,22 +20,48 @@ def main():
     print(f"Django script: {django_script}")
     print(f"React script: {react_script}")
     
+    # Launch the scripts directly; on Windows each gets its own console
+    # window instead of going through a PowerShell Start-Process wrapper
+    popen_kwargs = {'cwd': current_dir}
+    if sys.platform == 'win32':
+        popen_kwargs['creationflags'] = subprocess.CREATE_NEW_CONSOLE
+    
+    def server_command(script):
+        if sys.platform != 'win32':
+            return [python_exe, script]
+        # Run under cmd /k so the window stays open after the server exits
+        # and a startup traceback can still be read, as -NoExit did before.
+        # The outer quotes stop cmd from stripping the first and last quote
+        # of the command line
+        return f'cmd /k "{subprocess.list2cmdline([python_exe, script])}"'
+    
+    processes = []
     try:
-        # Use PowerShell instead of cmd for better path handling
-        django_cmd = f'powershell -Command "Start-Process powershell -ArgumentList \'-NoExit\', \'-Command\', \'cd {current_dir}; {python_exe} {django_script}\'"'
-        react_cmd = f'powershell -Command "Start-Process powershell -ArgumentList \'-NoExit\', \'-Command\', \'cd {current_dir}; {python_exe} {react_script}\'"'
-        
-        # Run both commands
-        subprocess.run(django_cmd, shell=True, check=True)
-        subprocess.run(react_cmd, shell=True, check=True)
-        
-        print("\nBoth servers have been started in separate terminals.")
-        print("You can close the servers by closing their respective terminal windows.")
-    except subprocess.CalledProcessError as e:
+        # Popen returns immediately, so both servers start in parallel
+        for script in (django_script, react_script):
+            processes.append(subprocess.Popen(server_command(script), **popen_kwargs))
+    except OSError as e:
         print(f"\nError starting servers: {e}")
         print("Please make sure all paths are correct and you have necessary permissions.")
-    except Exception as e:
-        print(f"\nUnexpected error: {e}")
+        for process in processes:
+            process.terminate()
+        return
+    
+    if sys.platform == 'win32':
+        print("\nBoth servers have been started in separate terminals.")
+        print("You can close the servers by closing their respective terminal windows.")
+        print("A window stays open after its server stops, so any error output can be read.")
+        return
+    
+    print("\nBoth servers are running. Press Ctrl+C to stop them.")
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
 
 if __name__ == "__main__":
     main()
@@ -3,30 +3,73 @@
 Test API endpoints to ensure the YOLO integration is working
 """
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+
+from token_cache import reuse_cached_tokens, save_cached_tokens
 
 BASE_URL = "http://127.0.0.1:8000/api"
 
+# Request bodies are encoded with orjson and sent as raw data
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# (connect, read) seconds applied to every call that does not pass its own
+DEFAULT_TIMEOUT = (2, 10)
+
+class TimeoutSession(requests.Session):
+    """Session that never waits on the server without a timeout"""
+    
+    def request(self, *args, **kwargs):
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        return super().request(*args, **kwargs)
+
+# Retry gateway errors and connection failures briefly, with backoff. Only
+# idempotent methods are retried: a 502 from a proxy can arrive after Django
+# already handled a POST, and replaying create-batch would duplicate it.
+RETRY_POLICY = Retry(
+    total=2,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+)
+
+# One keep-alive session for every call so requests reuse the open connection
+SESSION = TimeoutSession()
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=RETRY_POLICY))
+SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=RETRY_POLICY))
+
 def test_auth_endpoint():
     """Test authentication endpoint"""
     print("🔐 Testing authentication endpoint...")
     
-    # Test login with test credentials
     try:
-        response = requests.post(f"{BASE_URL}/auth/login/", 
-                               json={"username": "admin", "password": "admin"},
-                               headers={"Content-Type": "application/json"})
+        # Reuse the token from an earlier run when the server still accepts it
+        tokens = reuse_cached_tokens(SESSION, BASE_URL, "admin")
+        if tokens:
+            print("✅ Reusing cached token")
+            SESSION.headers.update({"Authorization": f"Bearer {tokens['access']}"})
+            return tokens["access"]
+        
+        # Test login with test credentials
+        response = SESSION.post(f"{BASE_URL}/auth/login/", 
+                              data=orjson.dumps({"username": "admin", "password": "admin"}),
+                              headers=JSON_HEADERS)
         
         print(f"📡 Login status: {response.status_code}")
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print("✅ Login successful!")
             print(f"📄 Response keys: {list(data.keys())}")
             # Try different possible token keys
             token = data.get('access') or data.get('access_token') or data.get('token') or data.get('accessToken')
             if token:
                 print(f"🔑 Token found: {token[:20]}...")
+                # Authenticate every later call on the shared session
+                SESSION.headers.update({"Authorization": f"Bearer {token}"})
+                save_cached_tokens(BASE_URL, "admin", token, data.get('refreshToken') or data.get('refresh'))
             return token
         else:
             print(f"⚠️ Login response: {response.text}")
@@ -42,41 +85,57 @@ def test_yolo_endpoints(token):
         print("❌ No auth token available for YOLO tests")
         return
         
-    headers = {"Authorization": f"Bearer {token}"}
-    
+    _report_yolo_endpoints(_fetch_yolo_endpoints)
+
+def _fetch_yolo_endpoints():
+    # Model info and batches come back from a single /api/batch/ round-trip
+    return SESSION.post(f"{BASE_URL}/batch/", data=orjson.dumps([
+        {"path": "/images/yolo-model-info/", "method": "GET"},
+        # Only the newest three batches, and only the fields printed below
+        {"path": "/images/batches/?limit=3&fields=id,status,total_files", "method": "GET"},
+    ]), headers=JSON_HEADERS)
+
+def _report_yolo_endpoints(get_response):
+    """Print the YOLO probe results; get_response returns the /batch/ response or raises"""
     print("\n🎯 Testing YOLO endpoints...")
     
+    try:
+        response = get_response()
+        response.raise_for_status()
+        model_info, batches_result = orjson.loads(response.content)
+    except Exception as e:
+        print(f"❌ YOLO endpoints batch error: {str(e)}")
+        return
+    
     # Test model info endpoint
     try:
-        response = requests.get(f"{BASE_URL}/images/yolo-model-info/", headers=headers)
-        print(f"📊 Model info status: {response.status_code}")
+        print(f"📊 Model info status: {model_info['status']}")
         
-        if response.status_code == 200:
-            data = response.json()
+        if model_info['status'] == 200:
+            data = model_info['body']
             print("✅ Model info retrieved successfully!")
             print(f"🏷️ Model: {data.get('model_info', {}).get('name', 'Unknown')}")
             print(f"🔢 Keypoints: {data.get('model_info', {}).get('keypoint_count', 0)}")
             print(f"🎯 Confidence: {data.get('confidence_threshold', 0)}")
             print(f"📁 Model exists: {data.get('model_exists', False)}")
         else:
-            print(f"⚠️ Model info error: {response.text}")
+            print(f"⚠️ Model info error: {model_info['body']}")
             
     except Exception as e:
         print(f"❌ Model info test error: {str(e)}")
     
     # Test batches endpoint
     try:
-        response = requests.get(f"{BASE_URL}/images/batches/", headers=headers)
-        print(f"📦 Batches status: {response.status_code}")
+        print(f"📦 Batches status: {batches_result['status']}")
         
-        if response.status_code == 200:
-            data = response.json()
+        if batches_result['status'] == 200:
+            data = batches_result['body']
             batches = data.get('batches', [])
-            print(f"✅ Found {len(batches)} batches")
+            print(f"✅ Found {data.get('total_count', len(batches))} batches")
             for batch in batches[:3]:  # Show first 3 batches
                 print(f"   📁 Batch {batch['id'][:8]}...: {batch['status']} ({batch['total_files']} files)")
         else:
-            print(f"⚠️ Batches error: {response.text}")
+            print(f"⚠️ Batches error: {batches_result['body']}")
             
     except Exception as e:
         print(f"❌ Batches test error: {str(e)}")
@@ -85,30 +144,31 @@ def test_create_batch(token):
     """Test creating a new batch"""
     if not token:
         return None
-        
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
+    
+    return _report_create_batch(_post_create_batch)
+
+def _post_create_batch():
+    batch_data = {
+        "total_files": 5,
+        "metadata": {
+            "test": "integration_test",
+            "timestamp": "2025-06-16T15:52:00Z"
+        }
     }
     
+    return SESSION.post(f"{BASE_URL}/images/create-batch/", data=orjson.dumps(batch_data), headers=JSON_HEADERS)
+
+def _report_create_batch(get_response):
+    """Print the batch creation result; get_response returns the response or raises"""
     print("\n📦 Testing batch creation...")
     
     try:
-        batch_data = {
-            "total_files": 5,
-            "metadata": {
-                "test": "integration_test",
-                "timestamp": "2025-06-16T15:52:00Z"
-            }
-        }
-        
-        response = requests.post(f"{BASE_URL}/images/create-batch/", 
-                               json=batch_data, headers=headers)
+        response = get_response()
         
         print(f"🆕 Create batch status: {response.status_code}")
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             batch_id = data.get('batch_id')
             print(f"✅ Batch created successfully: {batch_id}")
             return batch_id
@@ -126,11 +186,21 @@ def main():
     # Test authentication
     token = test_auth_endpoint()
     
-    # Test YOLO endpoints
-    test_yolo_endpoints(token)
-    
-    # Test batch creation
-    batch_id = test_create_batch(token)
+    if token:
+        # Both probes only need the token, so they run side by side on the
+        # pooled session; the results are printed afterwards, in order
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            yolo_future = executor.submit(_fetch_yolo_endpoints)
+            create_future = executor.submit(_post_create_batch)
+        
+        # Test YOLO endpoints
+        _report_yolo_endpoints(yolo_future.result)
+        
+        # Test batch creation
+        batch_id = _report_create_batch(create_future.result)
+    else:
+        test_yolo_endpoints(token)
+        batch_id = None
     
     print("\n" + "="*50)
     if token and batch_id:
@@ -0,0 +1,105 @@
+"""
+On-disk JWT cache shared by the API test scripts.
+
+Logging in runs a full password hash check on the server, so the scripts keep
+the access/refresh pair between runs and only log in again once the refresh
+token has expired too.
+"""
+import json
+import os
+import tempfile
+from pathlib import Path
+
+TOKEN_CACHE_PATH = Path.home() / ".kpa_test_tokens.json"
+
+def _cache_key(api_url, username):
+    return f"{api_url}|{username}"
+
+def _read_cache():
+    try:
+        with open(TOKEN_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_cached_tokens(api_url, username):
+    """Return the cached {"access", "refresh"} pair for this server and user, or None"""
+    tokens = _read_cache().get(_cache_key(api_url, username))
+    if isinstance(tokens, dict) and tokens.get("access"):
+        return tokens
+    return None
+
+def save_cached_tokens(api_url, username, access, refresh):
+    """
+    Store a token pair, replacing the cache file atomically.
+
+    The cache is only an optimisation, so a failed write is ignored and the
+    next run simply logs in again.
+    """
+    cache = _read_cache()
+    cache[_cache_key(api_url, username)] = {"access": access, "refresh": refresh}
+
+    # mkstemp creates the file 0600, so the tokens are only readable by us
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=TOKEN_CACHE_PATH.parent, prefix=".kpa_test_tokens.")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, TOKEN_CACHE_PATH)
+    except OSError:
+        os.unlink(tmp_path)
+
+def _store_refreshed(api_url, username, tokens, response):
+    data = response.json()
+    # Refresh tokens are rotated, so keep whichever one the server sent back
+    tokens = {"access": data["access"], "refresh": data.get("refresh", tokens["refresh"])}
+    save_cached_tokens(api_url, username, tokens["access"], tokens["refresh"])
+    return tokens
+
+def reuse_cached_tokens(client, api_url, username):
+    """
+    Return a usable cached token pair, or None if a password login is needed.
+
+    client is anything with requests-style get/post (a requests.Session or an
+    httpx.Client). An access token the server rejects with 401 is exchanged
+    through /auth/token/refresh/ and the new pair is written back.
+    """
+    tokens = load_cached_tokens(api_url, username)
+    if tokens is None:
+        return None
+
+    response = client.get(
+        f"{api_url}/auth/status/",
+        headers={"Authorization": f"Bearer {tokens['access']}"}
+    )
+    if response.status_code == 200:
+        return tokens
+    if response.status_code != 401 or not tokens.get("refresh"):
+        return None
+
+    response = client.post(f"{api_url}/auth/token/refresh/", json={"refresh": tokens["refresh"]})
+    if response.status_code != 200:
+        return None
+    return _store_refreshed(api_url, username, tokens, response)
+
+async def reuse_cached_tokens_async(client, api_url, username):
+    """reuse_cached_tokens() for an httpx.AsyncClient"""
+    tokens = load_cached_tokens(api_url, username)
+    if tokens is None:
+        return None
+
+    response = await client.get(
+        f"{api_url}/auth/status/",
+        headers={"Authorization": f"Bearer {tokens['access']}"}
+    )
+    if response.status_code == 200:
+        return tokens
+    if response.status_code != 401 or not tokens.get("refresh"):
+        return None
+
+    response = await client.post(f"{api_url}/auth/token/refresh/", json={"refresh": tokens["refresh"]})
+    if response.status_code != 200:
+        return None
+    return _store_refreshed(api_url, username, tokens, response)